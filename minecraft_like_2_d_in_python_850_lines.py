@@ -15,7 +15,8 @@ that learners can understand the structure. Overall length lands around
 850 lines including comments/docstrings.
 """
 from __future__ import annotations
-import math, os, json, random, sys, time, itertools
+import math, os, json, random, sys, time, itertools, threading, queue, struct, zlib, heapq
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Dict, Tuple, List, Optional
 
@@ -35,14 +36,24 @@ SEED = 2025
 SAVE_FILE = "world_edits_full.json"
 SETTINGS_FILE = "settings_full.json"
 SS_PATH = "screenshots"
+CAPTURE_QUEUE = 16             # frames buffered for the recorder before it starts dropping
+MAP_CACHE_BYTES = 8*1024*1024  # memory budget for world-map chunk thumbnails
+MAP_RADIUS = (24, 10)          # chunks shown around the player on the world map (x, y)
+MAP_BUILD_MS = 8               # time per frame spent building missing thumbnails
+TINT_STEPS = 48                # day-tint quantisation used by dirty-rect rendering
 
 # Gameplay toggles
 ENABLE_CAVES = True
 ENABLE_WATER = True
 ENABLE_PARTICLES = True
 
-# Input repeat
-pygame.key.set_repeat(250, 35)
+# Block ticks (see World.tick)
+TICK_RATE = 20                 # world ticks per second of unpaused play
+RANDOM_TICKS = 3               # random tile updates per loaded chunk per tick
+SIM_DISTANCE = 3               # chunks around the player that receive random ticks
+MAX_SCHEDULED = 256            # scheduled ticks run per world tick; the rest wait
+SAND_DELAY = 2                 # ticks before unsupported sand drops one tile
+LEAF_RANGE = 4                 # leaves further than this from WOOD decay
 
 # ---------------------------------------------------------------------------
 # Utility helpers
@@ -83,6 +94,24 @@ class ValueNoise1D:
             amp *= gain
             freq *= lac
         return s
+    def octave_bounds(self, x0: float, x1: float, octaves=4, lac=2.0, gain=0.5, scale=0.01) -> Tuple[float,float]:
+        """Lower/upper bound of octave() over x in [x0, x1].
+
+        smooth() blends two lattice values with weights in [0,1], so each octave
+        stays within the min/max of the lattice values its range touches.
+        """
+        amp = 1.0
+        freq = 1.0
+        lo = hi = 0.0
+        for _ in range(octaves):
+            i0 = math.floor(x0 * freq * scale)
+            i1 = math.floor(x1 * freq * scale) + 1
+            vals = [self.rc.r(i) for i in range(i0, i1+1)]
+            lo += amp * min(vals)
+            hi += amp * max(vals)
+            amp *= gain
+            freq *= lac
+        return lo, hi
 
 # ---------------------------------------------------------------------------
 # Blocks & items
@@ -114,6 +143,9 @@ BRICK = BlockType(13, "Brick", (172, 82, 68))
 
 BLOCKS: Dict[int, BlockType] = {b.id:b for b in [AIR,GRASS,DIRT,STONE,SAND,WATER,WOOD,LEAF,COAL,IRON,GLASS,FLOWR,PLANK,BRICK]}
 
+# blocks that react to random/scheduled ticks (World.block_tick)
+TICKABLE = frozenset({SAND.id, DIRT.id, LEAF.id})
+
 # hotbar default (ids)
 HOTBAR_DEFAULT = [GRASS.id, DIRT.id, STONE.id, SAND.id, WATER.id, WOOD.id, LEAF.id, GLASS.id, BRICK.id]
 
@@ -126,13 +158,107 @@ CRAFT_RECIPES = {
 # ---------------------------------------------------------------------------
 # World & generation
 # ---------------------------------------------------------------------------
+class CompactChunk:
+    """Palette-compressed CHUNK_SIZE x CHUNK_SIZE tile grid.
+
+    Each tile is a one-byte index into a small per-chunk palette of block
+    ids, so a chunk is ~1 KB of bytearray instead of 32 lists of 32 ints.
+    Tiles are stored row-major: tiles[ly*CHUNK_SIZE + lx].
+
+    A uniform chunk (all air, all stone, ...) has tiles=None and a one-entry
+    palette; it only allocates its grid on the first set() that differs.
+    """
+    __slots__ = ('palette', 'tiles')
+
+    def __init__(self, palette: Optional[List[int]] = None, tiles: Optional[bytearray] = None):
+        self.palette: List[int] = list(palette) if palette else [AIR.id]
+        self.tiles = tiles if tiles is not None else bytearray(CHUNK_SIZE*CHUNK_SIZE)
+
+    @classmethod
+    def uniform(cls, bid: int) -> "CompactChunk":
+        c = cls([bid])
+        c.tiles = None
+        return c
+
+    @property
+    def is_uniform(self) -> bool:
+        return self.tiles is None
+
+    @classmethod
+    def from_ids(cls, ids) -> "CompactChunk":
+        """Build from an iterable of CHUNK_SIZE*CHUNK_SIZE block ids (row-major)."""
+        palette: List[int] = []
+        lookup: Dict[int,int] = {}
+        tiles = bytearray(CHUNK_SIZE*CHUNK_SIZE)
+        for i, bid in enumerate(ids):
+            k = lookup.get(bid)
+            if k is None:
+                k = lookup[bid] = len(palette)
+                palette.append(bid)
+            tiles[i] = k
+        return cls(palette, tiles)
+
+    def get(self, lx: int, ly: int) -> int:
+        tiles = self.tiles
+        if tiles is None: return self.palette[0]
+        return self.palette[tiles[ly*CHUNK_SIZE + lx]]
+
+    def set(self, lx: int, ly: int, bid: int):
+        pal = self.palette
+        if self.tiles is None:
+            if bid == pal[0]: return
+            self.tiles = bytearray(CHUNK_SIZE*CHUNK_SIZE)  # promote to a full grid
+        if bid in pal:
+            k = pal.index(bid)
+        else:
+            if len(pal) >= 256:
+                self.repack()
+                if len(pal) >= 256:
+                    raise ValueError("chunk palette overflow")
+            k = len(pal)
+            pal.append(bid)
+        self.tiles[ly*CHUNK_SIZE + lx] = k
+
+    def repack(self):
+        """Drop palette entries no tile refers to any more.
+
+        The palette list is rewritten in place, so references to it held
+        by callers (set(), view()) stay valid.
+        """
+        if self.tiles is None: return
+        used = sorted(set(self.tiles))
+        if len(used) == len(self.palette): return
+        remap = bytearray(256)
+        for new, old in enumerate(used):
+            remap[old] = new
+        self.palette[:] = [self.palette[i] for i in used]
+        self.tiles = bytearray(self.tiles.translate(remap))
+
+    def view(self) -> Tuple[List[int], memoryview]:
+        """Zero-copy (palette, tiles) for renderers; tiles is indexed [ly, lx]."""
+        tiles = _UNIFORM_TILES if self.tiles is None else self.tiles
+        return self.palette, memoryview(tiles).cast('B', (CHUNK_SIZE, CHUNK_SIZE))
+
+_UNIFORM_TILES = bytes(CHUNK_SIZE*CHUNK_SIZE)  # shared all-zero grid behind uniform views
+
 @dataclass
 class World:
     seed: int
     edits: Dict[Tuple[int,int], int] = field(default_factory=dict)
-    chunks: Dict[Tuple[int,int], List[List[int]]] = field(default_factory=dict)
+    chunks: Dict[Tuple[int,int], CompactChunk] = field(default_factory=dict)
     sea_level: int = 16
     noise: ValueNoise1D = field(default_factory=lambda: ValueNoise1D(SEED))
+    # callbacks fn(x, y, bid) fired after every set(); renderers use them
+    listeners: List = field(default_factory=list, repr=False)
+    # block-tick scheduler: game tick counter, heap of (due, x, y), queued tiles
+    ticks: int = 0
+    scheduled: List[Tuple[int,int,int]] = field(default_factory=list, repr=False)
+    pending: set = field(default_factory=set, repr=False)
+    tick_rng: Optional[random.Random] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.tick_rng is None:
+            self.tick_rng = random.Random(self.seed)
 
     def load(self):
         if os.path.exists(SAVE_FILE):
@@ -162,9 +288,10 @@ class World:
         if t > 0.35:  return 'forest'
         return 'plains'
 
-    def generated_block(self, x: int, y: int) -> int:
-        h = self.height(x)
-        b = self.biome(x)
+    def generated_block(self, x: int, y: int, h: Optional[int] = None, b: Optional[str] = None) -> int:
+        # h/b may be passed in when the caller already has the column's height/biome
+        if h is None: h = self.height(x)
+        if b is None: b = self.biome(x)
         if y > h:
             # above ground; water if below/near sea
             if y <= self.sea_level:
@@ -192,33 +319,232 @@ class World:
         return STONE.id
 
     def get(self, x: int, y: int) -> int:
+        chunk = self.chunks.get((x//CHUNK_SIZE, y//CHUNK_SIZE))
+        if chunk is not None:
+            return chunk.get(x%CHUNK_SIZE, y%CHUNK_SIZE)
         if (x,y) in self.edits:
             return self.edits[(x,y)]
         return self.generated_block(x,y)
 
     def set(self, x: int, y: int, bid: int):
+        old = self.get(x,y)
         gen = self.generated_block(x,y)
         if bid == gen:
             self.edits.pop((x,y), None)
         else:
             self.edits[(x,y)] = bid
-        self.chunks.pop((x//CHUNK_SIZE, y//CHUNK_SIZE), None)
-
-    def ensure_chunk(self, cx: int, cy: int):
-        if (cx,cy) in self.chunks: return
-        grid = [[AIR.id for _ in range(CHUNK_SIZE)] for _ in range(CHUNK_SIZE)]
-        for lx in range(CHUNK_SIZE):
-            wx = cx*CHUNK_SIZE + lx
-            h = self.height(wx)
-            for ly in range(CHUNK_SIZE):
-                wy = cy*CHUNK_SIZE + ly
-                grid[ly][lx] = self.generated_block(wx, wy)
-        # apply edits
+        chunk = self.chunks.get((x//CHUNK_SIZE, y//CHUNK_SIZE))
+        if chunk is not None:
+            chunk.set(x%CHUNK_SIZE, y%CHUNK_SIZE, bid)
+        for fn in self.listeners:
+            fn(x, y, bid)
+        self.neighbors_changed(x, y, old, bid)
+
+    # ---------------- block ticks -----------------
+    def schedule(self, x: int, y: int, delay: int):
+        if (x,y) in self.pending: return
+        self.pending.add((x,y))
+        heapq.heappush(self.scheduled, (self.ticks + delay, x, y))
+
+    def neighbors_changed(self, x: int, y: int, old: int, bid: int):
+        if bid == SAND.id:
+            self.schedule(x, y, SAND_DELAY)
+        if self.get(x, y+1) == SAND.id:
+            self.schedule(x, y+1, SAND_DELAY)
+        if old == WOOD.id and bid != WOOD.id:
+            # leaves around a removed log get checked a little later, staggered
+            for ly in range(y-LEAF_RANGE, y+LEAF_RANGE+1):
+                for lx in range(x-LEAF_RANGE, x+LEAF_RANGE+1):
+                    if self.get(lx, ly) == LEAF.id:
+                        self.schedule(lx, ly, self.tick_rng.randint(20, 100))
+
+    def tick(self, center: Optional[Tuple[int,int]] = None, radius: int = SIM_DISTANCE):
+        """Advance one game tick: due scheduled ticks, then random ticks.
+
+        Random ticks visit RANDOM_TICKS tiles in each loaded chunk (only
+        those within radius chunks of center, when given), so the cost is
+        loaded chunks x budget.  Chunks whose palette has nothing tickable
+        are skipped outright.  Needs no display, so headless runs work too.
+        """
+        self.ticks += 1
+        heap = self.scheduled
+        for _ in range(MAX_SCHEDULED):
+            if not heap or heap[0][0] > self.ticks: break
+            _, x, y = heapq.heappop(heap)
+            self.pending.discard((x,y))
+            self.block_tick(x, y, self.get(x, y))
+        if center is None:
+            chunks = list(self.chunks.items())
+        else:
+            ccx, ccy = center[0]//CHUNK_SIZE, center[1]//CHUNK_SIZE
+            chunks = [((cx,cy), self.chunks[(cx,cy)])
+                      for cy in range(ccy-radius, ccy+radius+1)
+                      for cx in range(ccx-radius, ccx+radius+1) if (cx,cy) in self.chunks]
+        rng = self.tick_rng
+        for (cx,cy), chunk in chunks:
+            if TICKABLE.isdisjoint(chunk.palette): continue
+            for _ in range(RANDOM_TICKS):
+                lx, ly = rng.randrange(CHUNK_SIZE), rng.randrange(CHUNK_SIZE)
+                bid = chunk.get(lx, ly)
+                if bid in TICKABLE:
+                    self.block_tick(cx*CHUNK_SIZE+lx, cy*CHUNK_SIZE+ly, bid)
+
+    def block_tick(self, x: int, y: int, bid: int):
+        if bid == SAND.id:
+            below = self.get(x, y-1)
+            if below == AIR.id or BLOCKS[below].fluid:
+                self.set(x, y-1, SAND.id)
+                self.set(x, y, below)
+        elif bid == DIRT.id:
+            # grass spreads onto uncovered dirt next to grass
+            above = BLOCKS[self.get(x, y+1)]
+            if above.solid or above.fluid: return
+            for dy in (-1, 0, 1):
+                for dx in (-1, 1):
+                    if self.get(x+dx, y+dy) == GRASS.id:
+                        self.set(x, y, GRASS.id)
+                        return
+        elif bid == LEAF.id:
+            for ly in range(y-LEAF_RANGE, y+LEAF_RANGE+1):
+                for lx in range(x-LEAF_RANGE, x+LEAF_RANGE+1):
+                    if self.get(lx, ly) == WOOD.id: return
+            self.set(x, y, AIR.id)
+
+    def uniform_block(self, cx: int, cy: int, heights: List[int]) -> Optional[int]:
+        """Block id filling the whole generated chunk, or None if it is mixed.
+
+        Decided from the column heights and bounds on the cave/water noise
+        instead of evaluating generated_block for every tile.
+        """
+        x0, y0 = cx*CHUNK_SIZE, cy*CHUNK_SIZE
+        x1, y1 = x0+CHUNK_SIZE-1, y0+CHUNK_SIZE-1
+        lo, hi = min(heights), max(heights)
+        if y0 > hi:
+            # open sky or sea
+            if y0 > self.sea_level: return AIR.id
+            if y1 <= self.sea_level: return WATER.id
+            return None
+        if y1 > lo-4:
+            return None  # surface or dirt layer reaches into this chunk
+        if not ENABLE_CAVES:
+            return STONE.id
+        cmin, cmax = self.noise.octave_bounds(x0*13 + y0*7, x1*13 + y1*7, octaves=3, scale=0.05, gain=0.5)
+        if cmin > 0.35:
+            # solid rock; ores need cav > 0.52 and y < sea_level-4
+            if cmax <= 0.52 or y0 >= self.sea_level-4: return STONE.id
+            return None
+        if cmax <= 0.35:
+            # carved cave; water needs y <= sea_level-2 and the water noise > 0.15
+            if y0 > self.sea_level-2: return AIR.id
+            wmin, wmax = self.noise.octave_bounds(x0*5 - y1*3 + 1234, x1*5 - y0*3 + 1234, octaves=2, scale=0.06, gain=0.6)
+            if wmax <= 0.15: return AIR.id
+            if wmin > 0.15 and y1 <= self.sea_level-2: return WATER.id
+        return None
+
+    def ensure_chunk(self, cx: int, cy: int) -> CompactChunk:
+        chunk = self.chunks.get((cx,cy))
+        if chunk is None:
+            chunk = self.chunks[(cx,cy)] = self.build_chunk(cx, cy)
+        return chunk
+
+    def build_chunk(self, cx: int, cy: int) -> CompactChunk:
+        """Generated chunk with edits applied, without loading it."""
         x0,y0 = cx*CHUNK_SIZE, cy*CHUNK_SIZE
-        for (ex,ey),bid in self.edits.items():
-            if x0 <= ex < x0+CHUNK_SIZE and y0 <= ey < y0+CHUNK_SIZE:
-                grid[ey-y0][ex-x0] = bid
-        self.chunks[(cx,cy)] = grid
+        edits = [(ex-x0, ey-y0, bid) for (ex,ey),bid in self.edits.items()
+                 if x0 <= ex < x0+CHUNK_SIZE and y0 <= ey < y0+CHUNK_SIZE]
+        heights = [self.height(x0+lx) for lx in range(CHUNK_SIZE)]
+        bid = self.uniform_block(cx, cy, heights)
+        if bid is not None:
+            chunk = CompactChunk.uniform(bid)
+        else:
+            biomes = [self.biome(x0+lx) for lx in range(CHUNK_SIZE)]
+            chunk = CompactChunk.from_ids(self.generated_block(x0+lx, y0+ly, heights[lx], biomes[lx])
+                                          for ly in range(CHUNK_SIZE) for lx in range(CHUNK_SIZE))
+        # apply edits (promotes a uniform chunk on the first one)
+        for lx, ly, bid in edits:
+            chunk.set(lx, ly, bid)
+        return chunk
+
+# ---------------------------------------------------------------------------
+# World map thumbnails
+# ---------------------------------------------------------------------------
+MAP_AIR_COLOR = (120,170,230)
+
+class ChunkThumbnails:
+    """Mipmapped per-chunk thumbnails for the zoomed-out world map.
+
+    Level k of a chunk is a (CHUNK_SIZE>>k)-pixel square surface: level 0 is
+    one pixel per tile, the last level one pixel per chunk.  Thumbnails are
+    built straight from chunk palettes, patched on World.set, and kept in
+    an LRU that is trimmed to a byte budget.  A set only patches level 0
+    and marks the chunk stale; the smaller levels are redone when the map
+    next asks for it.  Chunks the world hasn't loaded are generated just
+    for the thumbnail and not kept.
+    """
+    def __init__(self, world: World, budget: int = MAP_CACHE_BYTES):
+        self.world = world
+        self.budget = budget
+        self.levels = CHUNK_SIZE.bit_length()
+        self.cache: "OrderedDict[Tuple[int,int], List[pygame.Surface]]" = OrderedDict()
+        self.stale: set = set()
+        self.used = 0
+        self.entry_bytes = sum((CHUNK_SIZE >> k)**2 * 4 for k in range(self.levels))
+        world.listeners.append(self.on_set)
+
+    @staticmethod
+    def color(bid: int) -> Tuple[int,int,int]:
+        return MAP_AIR_COLOR if bid == AIR.id else BLOCKS[bid].color
+
+    def get(self, cx: int, cy: int, level: int) -> Optional[pygame.Surface]:
+        mips = self.cache.get((cx,cy))
+        if mips is None: return None
+        if (cx,cy) in self.stale:
+            self.stale.discard((cx,cy))
+            mips[1:] = self.mipmaps(mips[0])[1:]
+        self.cache.move_to_end((cx,cy))
+        return mips[level]
+
+    def build(self, cx: int, cy: int) -> List[pygame.Surface]:
+        chunk = self.world.chunks.get((cx,cy)) or self.world.build_chunk(cx, cy)
+        base = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE))
+        if chunk.is_uniform:
+            base.fill(self.color(chunk.palette[0]))
+        else:
+            # palette index -> colour channel via translate tables, then interleave
+            rgb = bytearray(CHUNK_SIZE*CHUNK_SIZE*3)
+            cols = [self.color(b) for b in chunk.palette]
+            for ch in range(3):
+                table = bytearray(256)
+                for i, c in enumerate(cols):
+                    table[i] = c[ch]
+                rgb[ch::3] = chunk.tiles.translate(table)
+            # world y grows upwards, so row ly=0 belongs at the bottom
+            img = pygame.image.frombuffer(bytes(rgb), (CHUNK_SIZE, CHUNK_SIZE), "RGB")
+            base.blit(pygame.transform.flip(img, False, True), (0,0))
+        mips = self.mipmaps(base)
+        if (cx,cy) not in self.cache:
+            self.used += self.entry_bytes
+        self.cache[(cx,cy)] = mips
+        self.stale.discard((cx,cy))
+        while self.used > self.budget and len(self.cache) > 1:
+            key, _ = self.cache.popitem(last=False)
+            self.stale.discard(key)
+            self.used -= self.entry_bytes
+        return mips
+
+    def mipmaps(self, base: pygame.Surface) -> List[pygame.Surface]:
+        mips = [base]
+        for k in range(1, self.levels):
+            s = CHUNK_SIZE >> k
+            mips.append(pygame.transform.smoothscale(mips[-1], (s, s)))
+        return mips
+
+    def on_set(self, x: int, y: int, bid: int):
+        key = (x//CHUNK_SIZE, y//CHUNK_SIZE)
+        mips = self.cache.get(key)
+        if mips is None: return
+        mips[0].set_at((x%CHUNK_SIZE, CHUNK_SIZE-1 - y%CHUNK_SIZE), self.color(bid))
+        self.stale.add(key)
 
 # ---------------------------------------------------------------------------
 # Player
@@ -246,12 +572,75 @@ class Player:
 class Particle:
     x: float; y: float; vx: float; vy: float; life: float; col: Tuple[int,int,int]
 
+# ---------------------------------------------------------------------------
+# Background image writer (screenshots & frame capture)
+# ---------------------------------------------------------------------------
+def encode_png(w: int, h: int, rgb: bytes, level: int = 3) -> bytes:
+    """Minimal RGB8 PNG encoder.
+
+    pygame.image.save keeps the GIL while it encodes, which stalls the game
+    loop even from another thread; zlib.compress releases it.
+    """
+    stride = w*3
+    raw = b"".join(b"\x00" + rgb[y*stride:(y+1)*stride] for y in range(h))
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, level))
+            + chunk(b"IEND", b""))
+
+class ImageWriter:
+    """Encodes and writes surfaces on a worker thread.
+
+    submit() takes a surface the caller no longer draws to (a copy) and
+    never blocks: with a bounded queue, frames that don't fit are dropped
+    and counted instead of stalling the game loop.
+    """
+    def __init__(self, maxsize: int = 0):
+        self.queue: "queue.Queue" = queue.Queue(maxsize)
+        self.written = 0
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._work, name="image-writer", daemon=True)
+        self.thread.start()
+
+    def full(self) -> bool:
+        return self.queue.full()
+
+    def submit(self, surf, path) -> bool:
+        try:
+            self.queue.put_nowait((surf, path))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            if item is None: break
+            surf, path = item
+            try:
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                data = encode_png(surf.get_width(), surf.get_height(), pygame.image.tobytes(surf, "RGB"))
+                with open(path, 'wb') as f:
+                    f.write(data)
+                self.written += 1
+            except Exception as e:
+                print("Failed image write:", e)
+
+    def close(self):
+        """Finish pending writes and stop the worker."""
+        self.queue.put(None)
+        self.thread.join()
+
 # ---------------------------------------------------------------------------
 # Game
 # ---------------------------------------------------------------------------
 class Game:
     def __init__(self):
         pygame.init()
+        pygame.key.set_repeat(250, 35)
         pygame.display.set_caption("Minecraft‑like 2D (Full)")
         self.screen = pygame.display.set_mode((WINDOW_W, WINDOW_H))
         self.clock = pygame.time.Clock()
@@ -274,10 +663,34 @@ class Game:
         self.console_text = ""
         self.console_active = False
         self.water_accum: List[Tuple[int,int]] = []
+        self.tick_accum = 0.0
         self.particles: List[Particle] = []
 
         self.settings = self.load_settings()
 
+        # world map (Tab / `map`): zoom level k draws CHUNK_SIZE>>k pixels per chunk
+        self.show_map = False
+        self.map_zoom = 0
+        self.thumbs = ChunkThumbnails(self.world)
+
+        # screenshots and frame capture are encoded/written off the main loop
+        self.shot_writer = ImageWriter()
+        self.capture: Optional[ImageWriter] = None
+        self.capture_dir = ""
+        self.capture_every = 1
+        self.frame_no = 0
+        self.capture_seq = 0
+
+        # dirty-rect rendering (F4): only repaint what changed while the camera is still
+        self.dirty_render = self.settings.get("dirty_rects", False)
+        self.dirty_tiles: set = set()
+        self.world.listeners.append(self.on_tile_changed)
+        self.last_frame: Dict[str, object] = {}
+        self.text_cache: Dict[Tuple[str,Tuple[int,int,int],bool], pygame.Surface] = {}
+        self.pattern_cache: Dict[int, pygame.Surface] = {}
+        self.dusk_cache: Tuple[int, Optional[pygame.Surface]] = (0, None)
+        self.minimap_cache: Tuple[Optional[Tuple[int,int]], Optional[pygame.Surface]] = (None, None)
+
     # ---------------- settings ----------------
     def load_settings(self):
         if os.path.exists(SETTINGS_FILE):
@@ -288,6 +701,8 @@ class Game:
         return {
             "mouse_sensitivity": 1.0,
             "show_tutorial": True,
+            "dirty_rects": False,
+            "capture_every": 2,
         }
     def save_settings(self):
         try:
@@ -450,7 +865,12 @@ class Game:
         pygame.draw.rect(self.screen, col, r, border, border_radius=radius)
 
     def draw_text(self, txt, pos, col=(0,0,0), big=False):
-        surf = (self.big if big else self.font).render(txt, True, col)
+        key = (txt, col, big)
+        surf = self.text_cache.get(key)
+        if surf is None:
+            if len(self.text_cache) > 256:
+                self.text_cache.clear()
+            surf = self.text_cache[key] = (self.big if big else self.font).render(txt, True, col)
         self.screen.blit(surf, pos)
 
     def draw_block_icon(self, bid, rect):
@@ -462,28 +882,84 @@ class Game:
         pygame.draw.line(self.screen, (255,255,255), inner.topleft, (inner.right, inner.top))
 
     # ---------------- minimap ----------------
+    def minimap_rect(self):
+        return pygame.Rect(WINDOW_W-200-12, 12, 200, 120)
+
     def draw_minimap(self, camx, camy):
         if not self.show_minimap: return
+        px, py = int(self.player.x), int(self.player.y)
+        key, surf = self.minimap_cache
+        if key != (px, py) or surf is None:
+            surf = self.build_minimap(px, py)
+            self.minimap_cache = ((px, py), surf)
+        self.screen.blit(surf, self.minimap_rect().topleft)
+
+    def build_minimap(self, px, py):
         w, h = 200, 120
         surf = pygame.Surface((w,h), pygame.SRCALPHA)
         # sample world around player
-        px, py = int(self.player.x), int(self.player.y)
         sx, sy = 100, 60
+        views = {}
         for dy in range(-sy//2, sy//2):
+            wy = py+dy
             for dx in range(-sx//2, sx//2):
-                wx, wy = px+dx, py+dy
-                bid = self.world.get(wx, wy)
-                col = BLOCKS[bid].color
+                wx = px+dx
+                key = (wx//CHUNK_SIZE, wy//CHUNK_SIZE)
+                view = views.get(key)
+                if view is None:
+                    view = views[key] = self.world.ensure_chunk(*key).view()
+                palette, tiles = view
+                col = BLOCKS[palette[tiles[wy%CHUNK_SIZE, wx%CHUNK_SIZE]]].color
                 surf.set_at((dx+sx//2, sy//2-dy), col)
         pygame.draw.rect(surf, (255,255,255), (0,0,w-1,h-1), 2, border_radius=6)
         # player marker
         pygame.draw.circle(surf, (255,0,0), (sx//2, sy//2), 3)
-        self.screen.blit(surf, (WINDOW_W-w-12, 12))
+        return surf
+
+    # ---------------- world map ----------------
+    def set_map_zoom(self, level):
+        self.map_zoom = clamp(level, 0, self.thumbs.levels-1)
+
+    def draw_map(self):
+        self.screen.fill((12,12,18))
+        p = self.player
+        level = self.map_zoom
+        size = CHUNK_SIZE >> level
+        scale = size / CHUNK_SIZE          # pixels per tile
+        pcx, pcy = int(p.x)//CHUNK_SIZE, int(p.y)//CHUNK_SIZE
+        rx = min(MAP_RADIUS[0], int(WINDOW_W/size/2) + 1)
+        ry = min(MAP_RADIUS[1], int(WINDOW_H/size/2) + 1)
+        missing = []
+        for cy in range(pcy-ry, pcy+ry+1):
+            sy = int(WINDOW_H//2 - ((cy+1)*CHUNK_SIZE - p.y)*scale)
+            for cx in range(pcx-rx, pcx+rx+1):
+                sx = int(WINDOW_W//2 + (cx*CHUNK_SIZE - p.x)*scale)
+                thumb = self.thumbs.get(cx, cy, level)
+                if thumb is None:
+                    missing.append(((cx-pcx)**2 + (cy-pcy)**2, cx, cy))
+                    pygame.draw.rect(self.screen, (40,40,48), (sx, sy, size, size))
+                else:
+                    self.screen.blit(thumb, (sx, sy))
+        # fill in missing thumbnails nearest-first, within a per-frame time budget
+        deadline = time.perf_counter() + MAP_BUILD_MS/1000.0
+        for _, cx, cy in sorted(missing):
+            if time.perf_counter() > deadline: break
+            self.thumbs.build(cx, cy)
+        pygame.draw.circle(self.screen, (255,0,0), (WINDOW_W//2, WINDOW_H//2), 4)
+        self.draw_text(f"Map 1:{1 << level}  chunks {len(self.thumbs.cache)}  (+/- or wheel zoom, Tab close)",
+                       (10,10), (255,255,255))
 
     # ---------------- drawing world ----------------
-    def draw_world(self, camx, camy):
-        # sky gradient by time
+    def sky_tint(self) -> float:
         tnorm = (math.sin(self.day_time/180.0*math.tau)+1)*0.5
+        if self.dirty_render:
+            # snap to discrete steps so a still camera can keep its pixels between steps
+            tnorm = round(tnorm*TINT_STEPS)/TINT_STEPS
+        return tnorm
+
+    def draw_world(self, camx, camy, area=None):
+        # sky gradient by time
+        tnorm = self.sky_tint()
         sky_top = (int(30+150*tnorm), int(80+120*tnorm), int(180+50*tnorm))
         sky_bot = (int(10+60*tnorm), int(30+70*tnorm), int(120+40*tnorm))
         pygame.draw.rect(self.screen, sky_top, (0,0,WINDOW_W, WINDOW_H//2))
@@ -493,20 +969,33 @@ class Game:
         tx1 = int(math.ceil (camx + WINDOW_W/TILE/2)) + 1
         ty0 = int(math.floor(camy - WINDOW_H/TILE/2)) - 1
         ty1 = int(math.ceil (camy + WINDOW_H/TILE/2)) + 1
-        for ty in range(ty0, ty1+1):
-            cy = ty//CHUNK_SIZE
-            for tx in range(tx0, tx1+1):
-                cx = tx//CHUNK_SIZE
-                self.world.ensure_chunk(cx, cy)
-                bid = self.world.chunks[(cx,cy)][ty-cy*CHUNK_SIZE][tx-cx*CHUNK_SIZE]
-                if bid == AIR.id: continue
-                sx, sy = self.w2s(tx, ty, camx, camy)
-                r = pygame.Rect(sx, sy-TILE, TILE, TILE)
-                color = BLOCKS[bid].color
-                pygame.draw.rect(self.screen, color, r)
-                sh = 12
-                pygame.draw.line(self.screen, (max(0,color[0]-sh), max(0,color[1]-sh), max(0,color[2]-sh)), (r.left, r.bottom-1), (r.right-1, r.bottom-1))
-                pygame.draw.line(self.screen, (min(255,color[0]+sh), min(255,color[1]+sh), min(255,color[2]+sh)), (r.left, r.top), (r.right-1, r.top))
+        if area is not None:
+            # only the tiles under a dirty rect (screen y grows downwards, world y upwards)
+            ax0, ay1 = self.s2w(area.left, area.top, camx, camy)
+            ax1, ay0 = self.s2w(area.right, area.bottom, camx, camy)
+            tx0, tx1 = max(tx0, int(math.floor(ax0))), min(tx1, int(math.floor(ax1)))
+            ty0, ty1 = max(ty0, int(math.floor(ay0))), min(ty1, int(math.floor(ay1)))
+        for cy in range(ty0//CHUNK_SIZE, ty1//CHUNK_SIZE+1):
+            y0, y1 = max(ty0, cy*CHUNK_SIZE), min(ty1, cy*CHUNK_SIZE+CHUNK_SIZE-1)
+            for cx in range(tx0//CHUNK_SIZE, tx1//CHUNK_SIZE+1):
+                x0, x1 = max(tx0, cx*CHUNK_SIZE), min(tx1, cx*CHUNK_SIZE+CHUNK_SIZE-1)
+                chunk = self.world.ensure_chunk(cx, cy)
+                if chunk.is_uniform:
+                    # whole span in one blit of a pre-shaded tile pattern
+                    bid = chunk.palette[0]
+                    if bid == AIR.id: continue
+                    sx, sy = self.w2s(x0, y1, camx, camy)
+                    area_px = (0, 0, (x1-x0+1)*TILE, (y1-y0+1)*TILE)
+                    self.screen.blit(self.tile_pattern(bid), (sx, sy-TILE), area_px)
+                    continue
+                palette, tiles = chunk.view()
+                for ty in range(y0, y1+1):
+                    ly = ty-cy*CHUNK_SIZE
+                    for tx in range(x0, x1+1):
+                        bid = palette[tiles[ly, tx-cx*CHUNK_SIZE]]
+                        if bid == AIR.id: continue
+                        sx, sy = self.w2s(tx, ty, camx, camy)
+                        self.draw_tile(self.screen, pygame.Rect(sx, sy-TILE, TILE, TILE), BLOCKS[bid].color)
 
         # particles
         for p in self.particles:
@@ -516,20 +1005,78 @@ class Game:
         # dusk overlay
         darkness = int(110 * (1 - tnorm))
         if darkness > 0:
-            s = pygame.Surface((WINDOW_W, WINDOW_H), pygame.SRCALPHA)
-            s.fill((0,0,0,darkness))
+            level, s = self.dusk_cache
+            if s is None or level != darkness:
+                s = pygame.Surface((WINDOW_W, WINDOW_H), pygame.SRCALPHA)
+                s.fill((0,0,0,darkness))
+                self.dusk_cache = (darkness, s)
             self.screen.blit(s, (0,0))
 
-    def draw_player(self, camx, camy):
+    def draw_tile(self, surf, r, color):
+        pygame.draw.rect(surf, color, r)
+        sh = 12
+        pygame.draw.line(surf, (max(0,color[0]-sh), max(0,color[1]-sh), max(0,color[2]-sh)), (r.left, r.bottom-1), (r.right-1, r.bottom-1))
+        pygame.draw.line(surf, (min(255,color[0]+sh), min(255,color[1]+sh), min(255,color[2]+sh)), (r.left, r.top), (r.right-1, r.top))
+
+    def tile_pattern(self, bid):
+        """Surface tiled with one block, big enough for any on-screen chunk span."""
+        surf = self.pattern_cache.get(bid)
+        if surf is None:
+            # draw_world spans ceil(window/TILE)+1 tiles plus a margin of one each side
+            nx = min(CHUNK_SIZE, math.ceil(WINDOW_W/TILE) + 4)
+            ny = min(CHUNK_SIZE, math.ceil(WINDOW_H/TILE) + 4)
+            surf = pygame.Surface((nx*TILE, ny*TILE))
+            for ty in range(ny):
+                for tx in range(nx):
+                    self.draw_tile(surf, pygame.Rect(tx*TILE, ty*TILE, TILE, TILE), BLOCKS[bid].color)
+            self.pattern_cache[bid] = surf
+        return surf
+
+    def particle_rects(self, camx, camy):
+        rects = []
+        for p in self.particles:
+            sx, sy = self.w2s(p.x, p.y, camx, camy)
+            rects.append(pygame.Rect(sx-3, sy-3, 6, 6))
+        return rects
+
+    def player_rect(self, camx, camy):
         p = self.player
         sx, sy = self.w2s(p.x, p.y, camx, camy)
-        r = pygame.Rect(int(sx - p.w*TILE/2), int(sy - p.h*TILE), int(p.w*TILE), int(p.h*TILE))
+        return pygame.Rect(int(sx - p.w*TILE/2), int(sy - p.h*TILE), int(p.w*TILE), int(p.h*TILE))
+
+    def draw_player(self, camx, camy):
+        p = self.player
+        r = self.player_rect(camx, camy)
         pygame.draw.rect(self.screen, (235,220,180), r, border_radius=3)
         # simple eyes
         ex = r.centerx + (6 if p.facing>0 else -10)
         pygame.draw.rect(self.screen, (0,0,0), (ex, r.top+8, 4,4))
         pygame.draw.rect(self.screen, (0,0,0), (ex+6, r.top+8, 4,4))
 
+    def hotbar_rect(self):
+        pad = 8
+        w = len(self.player.hotbar)*(TILE+pad) + pad
+        x = (WINDOW_W - w)//2
+        y = WINDOW_H - (TILE+pad*3)
+        return pygame.Rect(x-6, y-6, w+12, TILE+12)
+
+    def hud_lines(self):
+        """HUD text as (text, pos); shared by draw_ui and the dirty-rect tracker."""
+        p = self.player
+        # inventory counts
+        inv_str = " ".join(f"{BLOCKS[k].name}:{v}" for k,v in sorted(p.inventory.items()))
+        # coords, time
+        hours = int(self.day_time//60)%24
+        mins = int(self.day_time%60)
+        lines = [
+            (inv_str[:80], (10, WINDOW_H-26)),
+            (f"XYZ: {p.x:.1f},{p.y:.1f}  Time {hours:02d}:{mins:02d}  FPS {self.clock.get_fps():.0f}", (10,10)),
+        ]
+        if self.settings.get("show_tutorial", True):
+            tuto = "WASD move, SPACE jump, LMB place, RMB mine, MouseWheel or 1-9 select, F5 save, M minimap, ` console"
+            lines.append((tuto[:110], (10, 34)))
+        return lines
+
     def draw_ui(self, camx, camy):
         # hotbar
         p = self.player
@@ -543,23 +1090,14 @@ class Game:
             self.draw_block_icon(bid, r)
             if i == p.selected:
                 self.draw_rect_border(r, (255,255,255), 3, 6)
-        # inventory counts
-        inv_str = " ".join(f"{BLOCKS[k].name}:{v}" for k,v in sorted(p.inventory.items()))
-        self.draw_text(inv_str[:80], (10, WINDOW_H-26))
-        # coords, time
-        hours = int(self.day_time//60)%24
-        mins = int(self.day_time%60)
-        self.draw_text(f"XYZ: {p.x:.1f},{p.y:.1f}  Time {hours:02d}:{mins:02d}  FPS {self.clock.get_fps():.0f}", (10,10))
-
-        if self.settings.get("show_tutorial", True):
-            tuto = "WASD move, SPACE jump, LMB place, RMB mine, MouseWheel or 1-9 select, F5 save, M minimap, ` console"
-            self.draw_text(tuto[:110], (10, 34))
+        for txt, pos in self.hud_lines():
+            self.draw_text(txt, pos)
 
     def draw_pause_menu(self):
         msg = [
             "Paused",
-            "Esc: Resume  |  F5: Save  |  F12: Screenshot",
-            "F1: Toggle tutorial  |  F3: Debug  |  M: Minimap",
+            "Esc: Resume  |  F5: Save  |  F11: Record  |  F12: Screenshot",
+            "F1: Toggle tutorial  |  F3: Debug  |  F4: Dirty rects  |  M: Minimap  |  Tab: Map",
         ]
         surf = pygame.Surface((WINDOW_W, WINDOW_H), pygame.SRCALPHA)
         surf.fill((0,0,0,128))
@@ -607,12 +1145,99 @@ class Game:
                 return "unknown item"
             if t0 == 'seed':
                 return str(self.world.seed)
+            if t0 == 'map':
+                # map [zoom]: toggle the world map, or open it at a zoom level
+                if len(tok)>=2:
+                    self.set_map_zoom(int(tok[1])); self.show_map = True
+                else:
+                    self.show_map = not self.show_map
+                return f"map {'on' if self.show_map else 'off'} zoom {self.map_zoom}"
+            if t0 == 'record':
+                # record [every_n] | record stop
+                if len(tok)>=2 and tok[1] == 'stop':
+                    return self.stop_capture()
+                return self.start_capture(int(tok[1]) if len(tok)>=2 else None)
             if t0 == 'help':
-                return "tp x y | time set HH:MM | time add m | give name n | seed"
+                return "tp x y | time set HH:MM | time add m | give name n | seed | map [zoom] | record [n]|stop"
         except Exception as e:
             return f"error: {e}"
         return "unknown command"
 
+    # ---------------- frame presentation ----------------
+    def draw_frame(self, camx, camy, area=None):
+        if self.show_map:
+            self.draw_map()
+        else:
+            self.draw_world(camx, camy, area)
+            self.draw_player(camx, camy)
+            self.draw_ui(camx, camy)
+            self.draw_minimap(camx, camy)
+        if self.paused:
+            self.draw_pause_menu()
+        if self.console_active:
+            self.draw_console()
+        if self.show_debug:
+            self.draw_debug_overlay(camx, camy)
+
+    def on_tile_changed(self, x, y, bid):
+        self.dirty_tiles.add((x, y))
+        self.minimap_cache = (None, None)
+
+    def present_dirty(self, camx, camy):
+        """Repaint only the regions that changed since the last frame.
+
+        Falls back to a full redraw whenever the camera moves, the day tint
+        steps, a fullscreen overlay (pause, console, debug, map) is showing,
+        or an overlay or the minimap was toggled since the last frame.
+        """
+        last = self.last_frame
+        tint = round(self.sky_tint()*TINT_STEPS)
+        hud = self.hud_lines()
+        hotbar_key = (self.player.selected, tuple(self.player.hotbar))
+        particles = self.particle_rects(camx, camy)
+        player = self.player_rect(camx, camy)
+        overlays = (self.paused, self.console_active, self.show_debug, self.show_map, self.show_minimap)
+        full = (last.get('cam') != (camx, camy) or last.get('tint') != tint
+                or last.get('overlays') != overlays or any(overlays[:4]))
+        if not full:
+            rects = particles + last.get('particles', [])
+            if player != last.get('player'):
+                rects += [player, last['player']]
+            for cur, prev in itertools.zip_longest(hud, last.get('hud', [])):
+                if prev is not None and cur == prev[:2]:
+                    continue
+                if cur is not None:
+                    rects.append(pygame.Rect(cur[1], self.font.size(cur[0])))
+                if prev is not None:
+                    rects.append(prev[2])
+            if hotbar_key != last.get('hotbar'):
+                rects.append(self.hotbar_rect())
+            if self.show_minimap and self.minimap_cache[0] is None:
+                rects.append(self.minimap_rect())
+            for tx, ty in self.dirty_tiles:
+                sx, sy = self.w2s(tx, ty, camx, camy)
+                rects.append(pygame.Rect(sx, sy-TILE, TILE, TILE))
+            screen_rect = self.screen.get_rect()
+            rects = [r.clip(screen_rect) for r in rects]
+            rects = [r for r in rects if r.w and r.h]
+            if len(rects) > 64:
+                # lots of scattered damage: one bounding repaint is cheaper
+                rects = [rects[0].unionall(rects[1:])]
+            for r in rects:
+                self.screen.set_clip(r)
+                self.draw_frame(camx, camy, area=r)
+            self.screen.set_clip(None)
+            pygame.display.update(rects)
+        else:
+            self.draw_frame(camx, camy)
+            pygame.display.flip()
+        self.dirty_tiles.clear()
+        self.last_frame = {
+            'cam': (camx, camy), 'tint': tint, 'player': player, 'hotbar': hotbar_key,
+            'particles': particles, 'overlays': overlays,
+            'hud': [(txt, pos, pygame.Rect(pos, self.font.size(txt))) for txt, pos in hud],
+        }
+
     # ---------------- main loop ----------------
     def run(self):
         running = True
@@ -635,6 +1260,11 @@ class Game:
                         self.player.selected = min(event.key - pygame.K_1, len(self.player.hotbar)-1)
                     elif event.key == pygame.K_F3:
                         self.show_debug = not self.show_debug
+                    elif event.key == pygame.K_F4:
+                        self.dirty_render = not self.dirty_render
+                        self.settings["dirty_rects"] = self.dirty_render
+                        self.last_frame = {}
+                        self.save_settings()
                     elif event.key == pygame.K_F1:
                         self.settings["show_tutorial"] = not self.settings.get("show_tutorial", True)
                         self.save_settings()
@@ -646,8 +1276,14 @@ class Game:
                             self.console_text = ""
                     elif event.key == pygame.K_F12:
                         self.screenshot()
+                    elif event.key == pygame.K_F11:
+                        print(self.stop_capture() if self.capture else self.start_capture())
                     elif event.key == pygame.K_m:
                         self.show_minimap = not self.show_minimap
+                    elif event.key == pygame.K_TAB and not self.console_active:
+                        self.show_map = not self.show_map
+                    elif event.key in (pygame.K_MINUS, pygame.K_EQUALS) and self.show_map and not self.console_active:
+                        self.set_map_zoom(self.map_zoom + (1 if event.key == pygame.K_MINUS else -1))
                     elif self.console_active:
                         if event.key == pygame.K_RETURN:
                             out = self.console_eval(self.console_text)
@@ -660,10 +1296,12 @@ class Game:
                             ch = event.unicode
                             if ch and 32 <= ord(ch) <= 126:
                                 self.console_text += ch
+                elif event.type == pygame.MOUSEWHEEL and self.show_map:
+                    self.set_map_zoom(self.map_zoom + (-1 if event.y>0 else 1))
                 elif event.type == pygame.MOUSEWHEEL and not self.paused and not self.console_active:
                     d = -1 if event.y>0 else 1
                     self.player.selected = (self.player.selected + d) % len(self.player.hotbar)
-                elif event.type == pygame.MOUSEBUTTONDOWN and not self.paused and not self.console_active:
+                elif event.type == pygame.MOUSEBUTTONDOWN and not self.paused and not self.console_active and not self.show_map:
                     now = time.time()
                     if now - last_click < 0.02:  # de‑bounce
                         continue
@@ -686,26 +1324,28 @@ class Game:
                 self.move_player(dt_real, keys)
                 self.step_particles(dt_real)
                 self.update_fluids()
+                # block ticks at a fixed rate; drop the backlog after a long hitch
+                self.tick_accum = min(self.tick_accum + dt_real*TICK_RATE, 5)
+                while self.tick_accum >= 1:
+                    self.world.tick(center=(int(self.player.x), int(self.player.y)))
+                    self.tick_accum -= 1
 
             # camera follows player
             camx, camy = self.player.x, self.player.y + 0.2
 
             # draw frame
-            self.draw_world(camx, camy)
-            self.draw_player(camx, camy)
-            self.draw_ui(camx, camy)
-            self.draw_minimap(camx, camy)
-            if self.paused:
-                self.draw_pause_menu()
-            if self.console_active:
-                self.draw_console()
-            if self.show_debug:
-                self.draw_debug_overlay(camx, camy)
-
-            pygame.display.flip()
+            if self.dirty_render:
+                self.present_dirty(camx, camy)
+            else:
+                self.draw_frame(camx, camy)
+                pygame.display.flip()
+            self.capture_frame()
 
         if pending_save:
             self.world.save()
+        if self.capture:
+            print(self.stop_capture())
+        self.shot_writer.close()
         pygame.quit()
 
     # ---------------- misc ----------------
@@ -714,7 +1354,7 @@ class Game:
         info = [
             f"pos=({p.x:.2f},{p.y:.2f}) vel=({p.vx:.2f},{p.vy:.2f}) facing={'R' if p.facing>0 else 'L'}",
             f"selected={BLOCKS[p.hotbar[p.selected]].name} seed={self.world.seed}",
-            f"chunks={len(self.world.chunks)} edits={len(self.world.edits)}",
+            f"chunks={len(self.world.chunks)} edits={len(self.world.edits)} ticks={self.world.ticks} scheduled={len(self.world.scheduled)}",
         ]
         s = pygame.Surface((WINDOW_W, 70), pygame.SRCALPHA)
         s.fill((0,0,0,140))
@@ -725,8 +1365,37 @@ class Game:
     def screenshot(self):
         ts = int(time.time())
         path = os.path.join(SS_PATH, f"shot_{ts}.png")
-        pygame.image.save(self.screen, path)
-        print("Saved screenshot:", path)
+        self.shot_writer.submit(self.screen.copy(), path)
+        print("Saving screenshot:", path)
+
+    def start_capture(self, every: Optional[int] = None):
+        if self.capture:
+            return "already recording"
+        self.capture_every = max(1, every or int(self.settings.get("capture_every", 2)))
+        self.capture_dir = os.path.join(SS_PATH, f"capture_{int(time.time())}")
+        self.capture = ImageWriter(CAPTURE_QUEUE)
+        self.frame_no = 0
+        self.capture_seq = 0
+        return f"recording every {self.capture_every} frame(s) to {self.capture_dir}"
+
+    def stop_capture(self):
+        if not self.capture:
+            return "not recording"
+        cap, self.capture = self.capture, None
+        cap.close()
+        return f"recorded {cap.written} frames ({cap.dropped} dropped) to {self.capture_dir}"
+
+    def capture_frame(self):
+        cap = self.capture
+        if not cap: return
+        self.frame_no += 1
+        if self.frame_no % self.capture_every: return
+        if cap.full():
+            cap.dropped += 1  # don't pay for a copy that would be thrown away
+            return
+        path = os.path.join(self.capture_dir, f"frame_{self.capture_seq:06d}.png")
+        if cap.submit(self.screen.copy(), path):
+            self.capture_seq += 1
 
 
 if __name__ == '__main__':